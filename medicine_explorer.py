@@ -1,15 +1,28 @@
 import os
 import sys
-import requests
-import PySimpleGUI as sg
+import time
+import threading
 
-from whoosh.index import open_dir
-from whoosh.qparser import MultifieldParser, OrGroup
-from whoosh import scoring
+# Pomiar importu PySimpleGUI/tkinter i ustawień GUI. Mierzony przy imporcie modułu, więc
+# razem z etapem "okno" daje czas do pierwszego okna tylko przy uruchomieniu jako __main__.
+_gui_import_start = time.perf_counter()
+import PySimpleGUI as sg
 
-from rejestr_produktow_leczniczych_parser import RejestrProduktowLeczniczychParser
+# Ciężkie moduły (requests, whoosh) oraz parser XML są ładowane leniwie w wątku
+# tła (load_index, load_requests, load_parser), aby okno pojawiało się natychmiast.
 
 sg.set_options(font=("Aptos", 12))
+GUI_IMPORT_TIME = time.perf_counter() - _gui_import_start
+
+# Etapy raportu czasu uruchamiania: (klucz, opis)
+STARTUP_STAGES = [
+    ("gui", "Import PySimpleGUI"),
+    ("okno", "Budowa pierwszego okna"),
+    ("import", "Import (whoosh)"),
+    ("indeks", "Otwarcie indeksu Whoosh"),
+    ("requests", "Import (requests)"),
+    ("xml", "Wczytanie pliku XML"),
+]
 
 def do_search(query_str, limit, sort_order, idx):
     """
@@ -40,6 +53,9 @@ def do_search(query_str, limit, sort_order, idx):
     if not query_str:
         return []
 
+    from whoosh.qparser import MultifieldParser, OrGroup
+    from whoosh import scoring
+
     parser = MultifieldParser(["nazwa", "nazwaPowszechna", "opis"], schema=idx.schema, group=OrGroup)
     search_query = parser.parse(query_str)
 
@@ -85,13 +101,101 @@ def build_table_values(final_results):
 
     return table_data
 
+def load_index(index_dir, timings):
+    """
+    Importuje moduły whoosh oraz otwiera indeks Whoosh.
+    Przeznaczona do wywołania w wątku tła.
+
+    Parametry:
+    - index_dir (str): Katalog z indeksem Whoosh.
+    - timings (dict): Słownik, do którego zapisywane są czasy etapów "import" i "indeks" (w sekundach).
+
+    Zwraca:
+    - whoosh.index.Index: Otwarty indeks Whoosh.
+    """
+
+    t0 = time.perf_counter()
+    from whoosh.index import open_dir
+    # Wstępne załadowanie modułów używanych w do_search (nazwy nie są tu używane)
+    import whoosh.qparser  # noqa: F401
+    import whoosh.scoring  # noqa: F401
+    timings["import"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    idx = open_dir(index_dir)
+    timings["indeks"] = time.perf_counter() - t0
+    return idx
+
+def load_requests(timings):
+    """
+    Importuje moduł requests używany przy pobieraniu plików PDF.
+    Przeznaczona do wywołania w wątku tła, po otwarciu indeksu.
+
+    Parametry:
+    - timings (dict): Słownik, do którego zapisywany jest czas etapu "requests" (w sekundach).
+    """
+
+    t0 = time.perf_counter()
+    # Wstępne załadowanie modułu dla pobierania PDF (nazwa nie jest tu używana)
+    import requests  # noqa: F401
+    timings["requests"] = time.perf_counter() - t0
+
+def load_parser(xml_path, timings):
+    """
+    Wczytuje plik XML rejestru do parsera RejestrProduktowLeczniczychParser.
+    Przeznaczona do wywołania w wątku tła.
+
+    Parametry:
+    - xml_path (str): Ścieżka do pliku XML.
+    - timings (dict): Słownik, do którego zapisywany jest czas etapu "xml" (w sekundach).
+
+    Zwraca:
+    - RejestrProduktowLeczniczychParser: Parser z wczytanym drzewem XML.
+    """
+
+    from rejestr_produktow_leczniczych_parser import RejestrProduktowLeczniczychParser
+
+    t0 = time.perf_counter()
+    parser = RejestrProduktowLeczniczychParser(xml_path)
+    timings["xml"] = time.perf_counter() - t0
+    return parser
+
+def format_startup_report(timings):
+    """
+    Przygotowuje raport czasu uruchamiania aplikacji.
+
+    Parametry:
+    - timings (dict): Czasy etapów w sekundach, klucze jak w STARTUP_STAGES.
+
+    Zwraca:
+    - str: Raport tekstowy, np.:
+      [medicine_explorer] Czas uruchamiania:
+        Import PySimpleGUI:            0.180 s
+        Budowa pierwszego okna:        0.232 s
+        Import (whoosh):               0.210 s
+        Otwarcie indeksu Whoosh:       0.015 s
+        Import (requests):             0.140 s
+        Wczytanie pliku XML:           3.870 s
+    """
+
+    lines = ["[medicine_explorer] Czas uruchamiania:"]
+    for key, label in STARTUP_STAGES:
+        if key in timings:
+            lines.append(f"  {label + ':':<30} {timings[key]:.3f} s")
+        else:
+            lines.append(f"  {label + ':':<30} -")
+    return "\n".join(lines)
+
 def medicine_explorer_app():
     """
     Główna funkcja aplikacji GUI do przeglądania i pobierania informacji o lekach.
 
-    - Ładuje parser XML (rejestr_produktow_leczniczych_parser.py) z pliku:
-      'resources/rejestr_produktow_leczniczych.xml'.
-    - Otwiera indeks Whoosh w katalogu 'indexdir'.
+    - Wyświetla okno od razu, a w wątku tła otwiera indeks Whoosh w katalogu 'indexdir'
+      i ładuje parser XML (rejestr_produktow_leczniczych_parser.py) z pliku
+      'resources/rejestr_produktow_leczniczych.xml'. Wyszukiwanie jest dostępne
+      po otwarciu indeksu, a przyciski korzystające z XML po wczytaniu pliku.
+    - Po zakończeniu ładowania wypisuje na konsolę raport czasu uruchamiania
+      (import PySimpleGUI, budowa pierwszego okna, import whoosh, indeks, import requests, XML).
     - Pozwala wyszukać leki wg słów kluczowych i ustalić liczbę wyników oraz metodę sortowania.
     - Wyświetla wyniki w tabeli:
       [ID, Nazwa, Nazwa powsz., Score]
@@ -107,19 +211,15 @@ def medicine_explorer_app():
     Zakończenie następuje po wybraniu "Wyjście" lub zamknięciu okna.
     """
 
-    parser = RejestrProduktowLeczniczychParser("resources/rejestr_produktow_leczniczych.xml")
+    start_time = time.perf_counter()
+    timings = {"gui": GUI_IMPORT_TIME}
 
+    xml_path = "resources/rejestr_produktow_leczniczych.xml"
     index_dir = "indexdir"
     if not os.path.exists(index_dir):
         sg.popup_error(f"Nie znaleziono katalogu indeksu: {index_dir}")
         sys.exit(1)
 
-    try:
-        idx = open_dir(index_dir)
-    except:
-        sg.popup_error(f"Nie można otworzyć indeksu w folderze: {index_dir}")
-        sys.exit(1)
-
     # Folder do pobierania plików PDF
     download_folder = "downloads"
     if not os.path.exists(download_folder):
@@ -132,7 +232,8 @@ def medicine_explorer_app():
          sg.Spin([i for i in range(1,101)], initial_value=10, key="-LIMIT-")],
         [sg.Text("Sortowanie:", size=(12,1)),
          sg.Combo(["Score", "Alfabetycznie"], default_value="Score", key="-SORT-", size=(20,1))],
-        [sg.Button("Szukaj", bind_return_key=True), sg.Button("Wyjście")]
+        [sg.Button("Szukaj", bind_return_key=True, disabled=True), sg.Button("Wyjście"),
+         sg.Text("Ładowanie indeksu...", key="-STATUS-", size=(40,1))]
     ]
 
     # Nagłówki i tabela
@@ -153,9 +254,9 @@ def medicine_explorer_app():
     # Przyciski operacyjne
     layout_bottom = [
         [sg.Button("Wyświetl opis", key="-SHOWDESC-"),
-         sg.Button("Wyświetl więcej informacji", key="-SHOWINFO-"),
-         sg.Button("Pobierz ulotkę", key="-GETULOTKA-"),
-         sg.Button("Pobierz charakterystykę", key="-GETCHAR-")]
+         sg.Button("Wyświetl więcej informacji", key="-SHOWINFO-", disabled=True),
+         sg.Button("Pobierz ulotkę", key="-GETULOTKA-", disabled=True),
+         sg.Button("Pobierz charakterystykę", key="-GETCHAR-", disabled=True)]
     ]
 
     # Kompletny layout
@@ -166,8 +267,48 @@ def medicine_explorer_app():
     ]
 
     # Okno PySimpleGUI
-    window = sg.Window("Przeglądarka leków (symptom-medicine-app)", layout, resizable=True, size=(1000,600))
-
+    window = sg.Window("Przeglądarka leków (symptom-medicine-app)", layout, resizable=True, size=(1000,600),
+                       finalize=True)
+    timings["okno"] = time.perf_counter() - start_time
+
+    # Ustawiane przed zamknięciem okna - wątek tła nie wysyła już wtedy zdarzeń
+    window_closed = threading.Event()
+
+    def post_event(key, value):
+        if window_closed.is_set():
+            return
+        try:
+            window.write_event_value(key, value)
+        except Exception:
+            # Okno mogło zostać zamknięte w trakcie ładowania
+            pass
+
+    def load_resources():
+        # Najpierw indeks (odblokowuje wyszukiwanie), potem requests i XML (szczegóły i pobieranie PDF)
+        try:
+            idx = load_index(index_dir, timings)
+        except Exception as e:
+            post_event("-INDEX-ERROR-", e)
+            return
+        post_event("-INDEX-READY-", idx)
+
+        try:
+            load_requests(timings)
+        except Exception:
+            # Błąd importu requests zgłaszają dopiero akcje pobierania PDF
+            pass
+
+        try:
+            parser = load_parser(xml_path, timings)
+        except Exception as e:
+            post_event("-XML-ERROR-", e)
+            return
+        post_event("-XML-READY-", parser)
+
+    threading.Thread(target=load_resources, daemon=True).start()
+
+    idx = None
+    parser = None
     cached_results = []
 
     while True:
@@ -175,7 +316,33 @@ def medicine_explorer_app():
         if event in (sg.WIN_CLOSED, "Wyjście"):
             break
 
+        if event == "-INDEX-READY-":
+            idx = values[event]
+            window["Szukaj"].update(disabled=False)
+            window["-STATUS-"].update("Ładowanie pliku XML...")
+
+        if event == "-INDEX-ERROR-":
+            sg.popup_error(f"Nie można otworzyć indeksu w folderze: {index_dir}\n{values[event]}")
+            window_closed.set()
+            window.close()
+            sys.exit(1)
+
+        if event == "-XML-READY-":
+            parser = values[event]
+            for key in ("-SHOWINFO-", "-GETULOTKA-", "-GETCHAR-"):
+                window[key].update(disabled=False)
+            window["-STATUS-"].update("")
+            print(format_startup_report(timings))
+
+        if event == "-XML-ERROR-":
+            window["-STATUS-"].update("Błąd wczytywania pliku XML")
+            sg.popup_error(f"Nie można wczytać pliku XML: {xml_path}\n{values[event]}")
+            print(format_startup_report(timings))
+
         if event == "Szukaj":
+            if idx is None:
+                # Enter w polu zapytania może wywołać zdarzenie przed otwarciem indeksu
+                continue
             query_str = values["-QUERY-"].strip()
             limit = int(values["-LIMIT-"])
             sort_order = values["-SORT-"]
@@ -195,6 +362,10 @@ def medicine_explorer_app():
                 sg.popup_error("Nie wybrano żadnego wiersza.")
                 continue
 
+            if event != "-SHOWDESC-" and parser is None:
+                sg.popup_error("Plik XML nie został jeszcze wczytany.")
+                continue
+
             row_index = selected[0]
             doc = cached_results[row_index]  # Słownik zwrócony przez do_search
             doc_id = doc.get("id", "")
@@ -230,6 +401,7 @@ def medicine_explorer_app():
                     sg.popup_error("Brak poprawnego adresu (ulotka) w XML.")
                     continue
                 try:
+                    import requests
                     r = requests.get(ulotka_url, timeout=10)
                     r.raise_for_status()
                     filename = os.path.join(download_folder, f"ulotka_{doc_id}.pdf")
@@ -245,6 +417,7 @@ def medicine_explorer_app():
                     sg.popup_error("Brak poprawnego adresu (charakterystyka) w XML.")
                     continue
                 try:
+                    import requests
                     r = requests.get(char_url, timeout=10)
                     r.raise_for_status()
                     filename = os.path.join(download_folder, f"charakterystyka_{doc_id}.pdf")
@@ -254,6 +427,7 @@ def medicine_explorer_app():
                 except Exception as e:
                     sg.popup_error(f"Błąd pobierania charakterystyki: {e}")
 
+    window_closed.set()
     window.close()
 
 if __name__ == "__main__":